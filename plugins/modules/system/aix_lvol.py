@@ -126,83 +126,105 @@ msg:
 '''
 
 import re
+import shlex
+from collections import namedtuple
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.text.converters import to_native
+from ansible.module_utils.six.moves import shlex_quote
+
+# Each field is collected with a single search over the whole command
+# output. Patterns whose marker starts a line are anchored; PP SIZE,
+# TOTAL PP and FREE PP sit in the second column of the two-column
+# lsvg/lslv output and cannot be.
+_RE_LV_HEADER = re.compile(r"^LOGICAL VOLUME:\s+(\w+)\s+VOLUME GROUP:\s+(\w+)", re.MULTILINE)
+_RE_LPS = re.compile(r"^LPs:\s+(\d+).*PPs", re.MULTILINE)
+_RE_POLICY = re.compile(r"^INTER-POLICY:\s+(\w+)", re.MULTILINE)
+_RE_VG_HEADER = re.compile(r"^VOLUME GROUP:\s+(\w+)", re.MULTILINE)
+_RE_PP_SIZE = re.compile(r"PP SIZE:\s+(\d+)")
+_RE_TOTAL_PP = re.compile(r"TOTAL PP.*\((\d+)")
+_RE_FREE_PP = re.compile(r"FREE PP.*\((\d+)")
+
+_LSVG_LSLV_SPLIT = "===AIX_LVOL_SPLIT==="
+
+# multipliers to megabytes per size unit
+_UNIT_MULT = {'M': 1, 'G': 1 << 10, 'T': 1 << 20}
+
+LVInfo = namedtuple('LVInfo', ('name', 'vg', 'size', 'policy'))
+VGInfo = namedtuple('VGInfo', ('name', 'size', 'free', 'pp_size'))
 
 
 def convert_size(module, size):
-    unit = size[-1].upper()
-    units = ['M', 'G', 'T']
-    try:
-        multiplier = 1024 ** units.index(unit)
-    except ValueError:
+    multiplier = _UNIT_MULT.get(size[-1].upper())
+    if multiplier is None:
         module.fail_json(msg="No valid size unit specified.")
 
     return int(size[:-1]) * multiplier
 
 
 def round_ppsize(x, base=16):
-    new_size = int(base * round(float(x) / base))
-    if new_size < x:
-        new_size += base
-    return new_size
+    # round up to the next multiple of base using integer math only
+    x = int(x)
+    return (x + base - 1) // base * base
+
+
+def _parse_field(regex, data, field, command):
+    match = regex.search(data)
+    if match is None:
+        raise ValueError("Unable to parse %s from %s output." % (field, command))
+    return match.group(1)
 
 
 def parse_lv(data):
-    name = None
-
-    for line in data.splitlines():
-        match = re.search(r"LOGICAL VOLUME:\s+(\w+)\s+VOLUME GROUP:\s+(\w+)", line)
-        if match is not None:
-            name = match.group(1)
-            vg = match.group(2)
-            continue
-        match = re.search(r"LPs:\s+(\d+).*PPs", line)
-        if match is not None:
-            lps = int(match.group(1))
-            continue
-        match = re.search(r"PP SIZE:\s+(\d+)", line)
-        if match is not None:
-            pp_size = int(match.group(1))
-            continue
-        match = re.search(r"INTER-POLICY:\s+(\w+)", line)
-        if match is not None:
-            policy = match.group(1)
-            continue
-
-    if not name:
+    match = _RE_LV_HEADER.search(data)
+    if match is None:
         return None
 
+    name = match.group(1)
+    vg = match.group(2)
+    lps = int(_parse_field(_RE_LPS, data, "LPs", "lslv"))
+    pp_size = int(_parse_field(_RE_PP_SIZE, data, "PP SIZE", "lslv"))
+    policy = _parse_field(_RE_POLICY, data, "INTER-POLICY", "lslv")
+
     size = lps * pp_size
 
-    return {'name': name, 'vg': vg, 'size': size, 'policy': policy}
+    return LVInfo(name=name, vg=vg, size=size, policy=policy)
 
 
 def parse_vg(data):
-
-    for line in data.splitlines():
-
-        match = re.search(r"VOLUME GROUP:\s+(\w+)", line)
-        if match is not None:
-            name = match.group(1)
-            continue
-
-        match = re.search(r"TOTAL PP.*\((\d+)", line)
-        if match is not None:
-            size = int(match.group(1))
-            continue
-
-        match = re.search(r"PP SIZE:\s+(\d+)", line)
-        if match is not None:
-            pp_size = int(match.group(1))
-            continue
-
-        match = re.search(r"FREE PP.*\((\d+)", line)
-        if match is not None:
-            free = int(match.group(1))
-            continue
-
-    return {'name': name, 'size': size, 'free': free, 'pp_size': pp_size}
+    name = _parse_field(_RE_VG_HEADER, data, "VOLUME GROUP", "lsvg")
+    size = int(_parse_field(_RE_TOTAL_PP, data, "TOTAL PPs", "lsvg"))
+    free = int(_parse_field(_RE_FREE_PP, data, "FREE PPs", "lsvg"))
+    pp_size = int(_parse_field(_RE_PP_SIZE, data, "PP SIZE", "lsvg"))
+
+    return VGInfo(name=name, size=size, free=free, pp_size=pp_size)
+
+
+def run_lsvg_lslv(module, lsvg_cmd, lslv_cmd, vg, lv):
+    """Run lsvg and lslv in a single shell invocation.
+
+    Returns (vg_rc, vg_info, lv_info, err). The two outputs are separated
+    by sentinel lines and the lsvg return code is emitted on stdout after
+    the second sentinel; the shell exit status cannot carry it reliably
+    since exit statuses wrap around at 256. Falls back to two sequential
+    calls if the combined output cannot be split on the sentinels. The
+    lslv return code is not reported: the caller detects a missing
+    logical volume by parse_lv() returning None.
+    """
+    marker = _LSVG_LSLV_SPLIT + "\n"
+    script = "%s %s; rc1=$?; echo '%s'; %s %s; echo '%s'; echo $rc1" % (
+        lsvg_cmd, shlex_quote(vg), _LSVG_LSLV_SPLIT, lslv_cmd, shlex_quote(lv), _LSVG_LSLV_SPLIT)
+    dummy, out, err = module.run_command(['/bin/sh', '-c', script])
+    vg_info, sep1, rest = out.partition(marker)
+    lv_info, sep2, tail = rest.rpartition(marker)
+    if sep1 and sep2:
+        try:
+            return int(tail), vg_info, lv_info, err
+        except ValueError:
+            pass
+    vg_rc, vg_info, err = module.run_command([lsvg_cmd, vg])
+    dummy, lv_info, dummy = module.run_command([lslv_cmd, lv])
+    return vg_rc, vg_info, lv_info, err
 
 
 def main():
@@ -231,49 +253,59 @@ def main():
     state = module.params['state']
     pvs = module.params['pvs']
 
-    pv_list = ' '.join(pvs)
+    if size:
+        # Validate the requested size before any command is run.
+        size_mb = convert_size(module, size)
 
     if policy == 'maximum':
         lv_policy = 'x'
     else:
         lv_policy = 'm'
 
-    # Add echo command when running in check-mode
+    # Prefix the commands with echo when running in check-mode
     if module.check_mode:
-        test_opt = 'echo '
+        test_opt = ['echo']
     else:
-        test_opt = ''
+        test_opt = []
 
-    # check if system commands are available
+    # check if system commands are available; resolve each binary once up
+    # front instead of walking PATH again in every branch below
     lsvg_cmd = module.get_bin_path("lsvg", required=True)
     lslv_cmd = module.get_bin_path("lslv", required=True)
+    mklv_cmd = module.get_bin_path("mklv", required=True)
+    rmlv_cmd = module.get_bin_path("rmlv", required=True)
+    chlv_cmd = module.get_bin_path("chlv", required=True)
+    extendlv_cmd = module.get_bin_path("extendlv", required=True)
 
-    # Get information on volume group requested
-    rc, vg_info, err = module.run_command("%s %s" % (lsvg_cmd, vg))
+    if state == 'present' and size:
+        # Creating or resizing needs both the volume group and the logical
+        # volume information; gather them in a single shell invocation.
+        rc, vg_info, lv_info, err = run_lsvg_lslv(module, lsvg_cmd, lslv_cmd, vg, lv)
 
-    if rc != 0:
-        if state == 'absent':
-            module.exit_json(changed=False, msg="Volume group %s does not exist." % vg)
-        else:
+        if rc != 0:
             module.fail_json(msg="Volume group %s does not exist." % vg, rc=rc, out=vg_info, err=err)
 
-    this_vg = parse_vg(vg_info)
+        try:
+            this_vg = parse_vg(vg_info)
+        except ValueError as e:
+            module.fail_json(msg=to_native(e), out=vg_info)
 
-    if size is not None:
         # Calculate pp size and round it up based on pp size.
-        lv_size = round_ppsize(convert_size(module, size), base=this_vg['pp_size'])
+        lv_size = round_ppsize(size_mb, base=this_vg.pp_size)
+    else:
+        # Get information on logical volume requested
+        rc, lv_info, err = module.run_command([lslv_cmd, lv])
 
-    # Get information on logical volume requested
-    rc, lv_info, err = module.run_command(
-        "%s %s" % (lslv_cmd, lv))
-
-    if rc != 0:
-        if state == 'absent':
-            module.exit_json(changed=False, msg="Logical Volume %s does not exist." % lv)
+        if rc != 0:
+            if state == 'absent':
+                module.exit_json(changed=False, msg="Logical Volume %s does not exist." % lv)
 
     changed = False
 
-    this_lv = parse_lv(lv_info)
+    try:
+        this_lv = parse_lv(lv_info)
+    except ValueError as e:
+        module.fail_json(msg=to_native(e), out=lv_info)
 
     if state == 'present' and not size:
         if this_lv is None:
@@ -281,13 +313,11 @@ def main():
 
     if this_lv is None:
         if state == 'present':
-            if lv_size > this_vg['free']:
-                module.fail_json(msg="Not enough free space in volume group %s: %s MB free." % (this_vg['name'], this_vg['free']))
+            if lv_size > this_vg.free:
+                module.fail_json(msg="Not enough free space in volume group %s: %s MB free." % (this_vg.name, this_vg.free))
 
             # create LV
-            mklv_cmd = module.get_bin_path("mklv", required=True)
-
-            cmd = "%s %s -t %s -y %s -c %s  -e %s %s %s %sM %s" % (test_opt, mklv_cmd, lv_type, lv, copies, lv_policy, opts, vg, lv_size, pv_list)
+            cmd = test_opt + [mklv_cmd, '-t', lv_type, '-y', lv, '-c', str(copies), '-e', lv_policy] + shlex.split(opts) + [vg, '%sM' % lv_size] + pvs
             rc, out, err = module.run_command(cmd)
             if rc == 0:
                 module.exit_json(changed=True, msg="Logical volume %s created." % lv)
@@ -296,40 +326,37 @@ def main():
     else:
         if state == 'absent':
             # remove LV
-            rmlv_cmd = module.get_bin_path("rmlv", required=True)
-            rc, out, err = module.run_command("%s %s -f %s" % (test_opt, rmlv_cmd, this_lv['name']))
+            rc, out, err = module.run_command(test_opt + [rmlv_cmd, '-f', this_lv.name])
             if rc == 0:
                 module.exit_json(changed=True, msg="Logical volume %s deleted." % lv)
             else:
                 module.fail_json(msg="Failed to remove logical volume %s." % lv, rc=rc, out=out, err=err)
         else:
-            if this_lv['policy'] != policy:
+            if vg != this_lv.vg:
+                module.fail_json(msg="Logical volume %s already exist in volume group %s" % (lv, this_lv.vg))
+
+            if this_lv.policy != policy:
                 # change lv allocation policy
-                chlv_cmd = module.get_bin_path("chlv", required=True)
-                rc, out, err = module.run_command("%s %s -e %s %s" % (test_opt, chlv_cmd, lv_policy, this_lv['name']))
+                rc, out, err = module.run_command(test_opt + [chlv_cmd, '-e', lv_policy, this_lv.name])
                 if rc == 0:
                     module.exit_json(changed=True, msg="Logical volume %s policy changed: %s." % (lv, policy))
                 else:
                     module.fail_json(msg="Failed to change logical volume %s policy." % lv, rc=rc, out=out, err=err)
 
-            if vg != this_lv['vg']:
-                module.fail_json(msg="Logical volume %s already exist in volume group %s" % (lv, this_lv['vg']))
-
             # from here the last remaining action is to resize it, if no size parameter is passed we do nothing.
             if not size:
                 module.exit_json(changed=False, msg="Logical volume %s already exist." % (lv))
 
             # resize LV based on absolute values
-            if int(lv_size) > this_lv['size']:
-                extendlv_cmd = module.get_bin_path("extendlv", required=True)
-                cmd = "%s %s %s %sM" % (test_opt, extendlv_cmd, lv, lv_size - this_lv['size'])
+            if int(lv_size) > this_lv.size:
+                cmd = test_opt + [extendlv_cmd, lv, '%sM' % (lv_size - this_lv.size)]
                 rc, out, err = module.run_command(cmd)
                 if rc == 0:
                     module.exit_json(changed=True, msg="Logical volume %s size extended to %sMB." % (lv, lv_size))
                 else:
                     module.fail_json(msg="Unable to resize %s to %sMB." % (lv, lv_size), rc=rc, out=out, err=err)
-            elif lv_size < this_lv['size']:
-                module.fail_json(msg="No shrinking of Logical Volume %s permitted. Current size: %s MB" % (lv, this_lv['size']))
+            elif lv_size < this_lv.size:
+                module.fail_json(msg="No shrinking of Logical Volume %s permitted. Current size: %s MB" % (lv, this_lv.size))
             else:
                 module.exit_json(changed=False, msg="Logical volume %s size is already %sMB." % (lv, lv_size))
 
@@ -0,0 +1,153 @@
+# Copyright (c) Ansible project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import pytest
+
+from ansible_collections.community.general.tests.unit.compat.mock import MagicMock
+from ansible_collections.community.general.plugins.modules.system import aix_lvol
+
+
+LSVG_OUTPUT = """\
+VOLUME GROUP:       rootvg                   VG IDENTIFIER:  000577b24c1f66cd0000013962b23646
+VG STATE:           active                   PP SIZE:        16 megabyte(s)
+VG PERMISSION:      read/write               TOTAL PPs:      542 (8672 megabytes)
+MAX LVs:            256                      FREE PPs:       431 (6896 megabytes)
+LVs:                14                       USED PPs:       111 (1776 megabytes)
+OPEN LVs:           13                       QUORUM:         2 (Enabled)
+TOTAL PVs:          1                        VG DESCRIPTORS: 2
+STALE PVs:          0                        STALE PPs:      0
+ACTIVE PVs:         1                        AUTO ON:        yes
+MAX PPs per VG:     32512
+MAX PPs per PV:     1016                     MAX PVs:        32
+LTG size (Dynamic): 256 kilobyte(s)          AUTO SYNC:      no
+HOT SPARE:          no                       BB POLICY:      relocatable
+"""
+
+LSLV_OUTPUT = """\
+LOGICAL VOLUME:     testlv                 VOLUME GROUP:   rootvg
+LV IDENTIFIER:      000577b24c1f66cd0000013962b23646.15 PERMISSION:     read/write
+VG STATE:           active/complete        LV STATE:       closed/syncd
+TYPE:               jfs2                   WRITE VERIFY:   off
+MAX LPs:            512                    PP SIZE:        16 megabyte(s)
+COPIES:             1                      SCHED POLICY:   parallel
+LPs:                32                     PPs:            32
+STALE PPs:          0                      BB POLICY:      relocatable
+INTER-POLICY:       maximum                RELOCATABLE:    yes
+INTRA-POLICY:       middle                 UPPER BOUND:    32
+MOUNT POINT:        N/A                    LABEL:          None
+MIRROR WRITE CONSISTENCY: on/ACTIVE
+EACH LP COPY ON A SEPARATE PV ?: yes
+Serialize IO ?:     NO
+"""
+
+LSLV_MISSING_OUTPUT = "0516-306 lslv: Logical volume testlv not found.\n"
+
+
+class FailJson(Exception):
+    pass
+
+
+def make_module():
+    module = MagicMock()
+    module.fail_json.side_effect = FailJson()
+    return module
+
+
+def test_parse_vg():
+    vg = aix_lvol.parse_vg(LSVG_OUTPUT)
+    assert vg.name == 'rootvg'
+    assert vg.size == 8672
+    assert vg.free == 6896
+    assert vg.pp_size == 16
+
+
+def test_parse_vg_missing_field():
+    with pytest.raises(ValueError, match="TOTAL PPs"):
+        aix_lvol.parse_vg(LSVG_OUTPUT.replace("TOTAL PPs", "XXX"))
+
+
+def test_parse_lv():
+    lv = aix_lvol.parse_lv(LSLV_OUTPUT)
+    assert lv.name == 'testlv'
+    assert lv.vg == 'rootvg'
+    assert lv.size == 512
+    assert lv.policy == 'maximum'
+
+
+def test_parse_lv_missing_lv():
+    assert aix_lvol.parse_lv(LSLV_MISSING_OUTPUT) is None
+
+
+def test_parse_lv_missing_field():
+    with pytest.raises(ValueError, match="INTER-POLICY"):
+        aix_lvol.parse_lv(LSLV_OUTPUT.replace("INTER-POLICY", "XXX"))
+
+
+def test_convert_size():
+    module = make_module()
+    assert aix_lvol.convert_size(module, '512M') == 512
+    assert aix_lvol.convert_size(module, '1G') == 1024
+    assert aix_lvol.convert_size(module, '2T') == 2 * 1024 * 1024
+    assert aix_lvol.convert_size(module, '512m') == 512
+
+
+def test_convert_size_invalid_unit():
+    with pytest.raises(FailJson):
+        aix_lvol.convert_size(make_module(), '512K')
+
+
+def test_round_ppsize():
+    assert aix_lvol.round_ppsize(0) == 0
+    assert aix_lvol.round_ppsize(1) == 16
+    assert aix_lvol.round_ppsize(16) == 16
+    assert aix_lvol.round_ppsize(17) == 32
+    assert aix_lvol.round_ppsize(100, base=7) == 105
+
+
+def test_run_lsvg_lslv_combined():
+    marker = aix_lvol._LSVG_LSLV_SPLIT + "\n"
+    module = MagicMock()
+    module.run_command.return_value = (0, LSVG_OUTPUT + marker + LSLV_OUTPUT + marker + "0\n", '')
+
+    vg_rc, vg_info, lv_info, err = aix_lvol.run_lsvg_lslv(module, 'lsvg', 'lslv', 'rootvg', 'testlv')
+
+    assert vg_rc == 0
+    assert vg_info == LSVG_OUTPUT
+    assert lv_info == LSLV_OUTPUT
+    assert module.run_command.call_count == 1
+
+
+def test_run_lsvg_lslv_combined_large_rc():
+    # return codes above 15 must survive the decoding unmangled
+    marker = aix_lvol._LSVG_LSLV_SPLIT + "\n"
+    module = MagicMock()
+    module.run_command.return_value = (0, marker + LSLV_MISSING_OUTPUT + marker + "255\n", 'lsvg error')
+
+    vg_rc, vg_info, lv_info, err = aix_lvol.run_lsvg_lslv(module, 'lsvg', 'lslv', 'rootvg', 'testlv')
+
+    assert vg_rc == 255
+    assert vg_info == ''
+    assert lv_info == LSLV_MISSING_OUTPUT
+    assert err == 'lsvg error'
+
+
+def test_run_lsvg_lslv_fallback():
+    # output without the sentinels triggers two sequential calls
+    module = MagicMock()
+    module.run_command.side_effect = [
+        (0, 'unexpected output', ''),
+        (2, LSVG_OUTPUT, 'vg error'),
+        (1, LSLV_MISSING_OUTPUT, 'lv error'),
+    ]
+
+    vg_rc, vg_info, lv_info, err = aix_lvol.run_lsvg_lslv(module, 'lsvg', 'lslv', 'rootvg', 'testlv')
+
+    assert vg_rc == 2
+    assert vg_info == LSVG_OUTPUT
+    assert lv_info == LSLV_MISSING_OUTPUT
+    assert err == 'vg error'
+    assert module.run_command.call_count == 3